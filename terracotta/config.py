@@ -95,6 +95,9 @@ class TerracottaSettings(NamedTuple):
     #: Maximum number of metadata keys per POST /metadata request
     MAX_POST_METADATA_KEYS: int = 100
 
+    #: URL of a running Terracotta server's /clear_cache endpoint to notify after ingestion
+    CLEAR_CACHE_URL: Optional[str] = None
+
 
 AVAILABLE_SETTINGS: Tuple[str, ...] = TerracottaSettings._fields
 
@@ -163,6 +166,8 @@ class SettingSchema(Schema):
 
     MAX_POST_METADATA_KEYS = fields.Integer(validate=validate.Range(min=1))
 
+    CLEAR_CACHE_URL = fields.String(allow_none=True)
+
     @pre_load
     def decode_lists(self, data: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
         for var in (
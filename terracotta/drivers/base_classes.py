@@ -11,10 +11,12 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -88,6 +90,17 @@ class MetaStore(ABC):
         """
         pass
 
+    def bulk_insert_mode(
+        self, unsafe: bool = False
+    ) -> contextlib.AbstractContextManager:
+        """Context manager to speed up many consecutive insertions.
+
+        Backends may tune their connection settings for throughput while this is active.
+        If ``unsafe`` is set, durability may be traded for speed (the database may be
+        corrupted on power loss or crash). Defaults to keeping a connection open.
+        """
+        return self.connect()
+
     @abstractmethod
     def get_keys(self) -> OrderedDict:
         """Get all known keys and their fulltext descriptions."""
@@ -105,6 +118,11 @@ class MetaStore(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_dataset_keys(self) -> Set[Tuple[str, ...]]:
+        """Get all known dataset key combinations, without paths or metadata."""
+        pass
+
     @abstractmethod
     def get_metadata(self, keys: KeysType) -> Optional[Dict[str, Any]]:
         """Return all stored metadata for given keys."""
@@ -118,6 +136,30 @@ class MetaStore(ABC):
         if metadata is specified and not `None`."""
         pass
 
+    @abstractmethod
+    def insert_many(
+        self,
+        datasets: Iterable[Tuple[KeysType, str, Optional[Mapping[str, Any]]]],
+        *,
+        batch_size: int = 1000,
+        encoded_metadata: bool = False,
+    ) -> None:
+        """Register many datasets given as ``(keys, path, metadata)`` tuples,
+        committing once per batch instead of once per dataset.
+
+        If ``encoded_metadata`` is set, all given metadata has already been passed
+        through :meth:`encode_metadata`.
+        """
+        pass
+
+    def encode_metadata(self, metadata: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Transform metadata to the representation stored in the database.
+
+        Allows callers to prepare metadata for :meth:`insert_many` ahead of time,
+        e.g. in worker processes.
+        """
+        return metadata
+
     @abstractmethod
     def delete(self, keys: KeysType) -> None:
         """Remove a dataset, including information from the metadata database."""
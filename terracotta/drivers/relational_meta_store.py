@@ -5,12 +5,25 @@ Base class for relational database drivers, using SQLAlchemy.
 
 import contextlib
 import functools
+import itertools
 import json
 import re
 import urllib.parse as urlparse
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Type, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import sqlalchemy as sqla
@@ -358,6 +371,19 @@ class RelationalMetaStore(MetaStore, ABC):
         datasets = {keytuple(row): row.path for row in result}
         return datasets
 
+    @trace("get_dataset_keys")
+    @convert_exceptions("Could not retrieve datasets")
+    def get_dataset_keys(self) -> Set[Tuple[str, ...]]:
+        datasets_table = sqla.Table(
+            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        stmt = sqla.select(*[datasets_table.c[key] for key in self.key_names])
+
+        with self.connect() as conn:
+            result = conn.execute(stmt).all()
+
+        return {tuple(row) for row in result}
+
     @trace("get_metadata")
     @convert_exceptions("Could not retrieve metadata")
     def get_metadata(self, keys: KeysType) -> Optional[Dict[str, Any]]:
@@ -413,6 +439,73 @@ class RelationalMetaStore(MetaStore, ABC):
                 )
                 conn.execute(metadata_table.insert().values(**keys, **encoded_data))
 
+    @trace("insert_many")
+    @requires_writable
+    @convert_exceptions("Could not write to database")
+    def insert_many(
+        self,
+        datasets: Iterable[Tuple[KeysType, str, Optional[Mapping[str, Any]]]],
+        *,
+        batch_size: int = 1000,
+        encoded_metadata: bool = False,
+    ) -> None:
+        datasets_table = sqla.Table(
+            "datasets", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+        metadata_table = sqla.Table(
+            "metadata", self.sqla_metadata, autoload_with=self.sqla_engine
+        )
+
+        # statements are compiled once and executed with one parameter set per row
+        delete_datasets = datasets_table.delete().where(
+            *[datasets_table.c[key] == sqla.bindparam(key) for key in self.key_names]
+        )
+        delete_metadata = metadata_table.delete().where(
+            *[metadata_table.c[key] == sqla.bindparam(key) for key in self.key_names]
+        )
+
+        def insert_batch(
+            batch: Iterable[Tuple[KeysType, str, Optional[Mapping[str, Any]]]]
+        ) -> bool:
+            # later occurrences of the same keys take precedence
+            key_rows: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+            dataset_rows: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+            metadata_rows: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+            for keys, path, metadata in batch:
+                keytuple = tuple(keys[key] for key in self.key_names)
+                key_rows[keytuple] = dict(keys)
+                dataset_rows[keytuple] = dict(keys, path=path)
+                if metadata is not None:
+                    if not encoded_metadata:
+                        metadata = self._encode_data(metadata)
+                    metadata_rows[keytuple] = dict(keys, **metadata)
+
+            if not key_rows:
+                return False
+
+            # nested connections commit on exit, so each batch is one transaction
+            with self.connect() as conn:
+                conn.execute(delete_datasets, list(key_rows.values()))
+                conn.execute(datasets_table.insert(), list(dataset_rows.values()))
+
+                if metadata_rows:
+                    conn.execute(
+                        delete_metadata,
+                        [key_rows[keytuple] for keytuple in metadata_rows],
+                    )
+                    conn.execute(metadata_table.insert(), list(metadata_rows.values()))
+
+            return True
+
+        datasets = iter(datasets)
+
+        with self.connect():
+            # rows are only referenced from within insert_batch, so memory is freed
+            # before the next batch is requested from the (possibly lazy) input
+            while insert_batch(itertools.islice(datasets, batch_size)):
+                pass
+
     @trace("delete")
     @requires_writable
     @convert_exceptions("Could not write to database")
@@ -445,6 +538,9 @@ class RelationalMetaStore(MetaStore, ABC):
                 )
             )
 
+    def encode_metadata(self, metadata: Mapping[str, Any]) -> Dict[str, Any]:
+        return self._encode_data(metadata)
+
     @staticmethod
     def _encode_data(decoded: Mapping[str, Any]) -> Dict[str, Any]:
         """Transform from internal format to database representation"""
@@ -3,9 +3,12 @@
 SQLite-backed metadata driver. Metadata is stored in an SQLite database.
 """
 
+import contextlib
 import os
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterator, Union
+
+import sqlalchemy as sqla
 
 from terracotta.drivers.relational_meta_store import RelationalMetaStore
 
@@ -46,6 +49,10 @@ class SQLiteMetaStore(RelationalMetaStore):
     SQL_KEY_SIZE = 256
     SQL_TIMEOUT_KEY = "timeout"
 
+    # per-connection settings applied during bulk inserts
+    # (temp_store=2 is MEMORY, negative cache sizes are in KiB)
+    _BULK_INSERT_PRAGMAS: Dict[str, int] = {"temp_store": 2, "cache_size": -200_000}
+
     def __init__(self, path: Union[str, Path]) -> None:
         """Initialize the SQLiteDriver.
 
@@ -70,3 +77,26 @@ class SQLiteMetaStore(RelationalMetaStore):
         so no need to do anything here
         """
         pass
+
+    @contextlib.contextmanager
+    def bulk_insert_mode(self, unsafe: bool = False) -> Iterator:
+        pragmas = dict(self._BULK_INSERT_PRAGMAS)
+        if unsafe:
+            # do not wait for data to reach the disk on commit
+            pragmas["synchronous"] = 0
+
+        with self.connect() as conn:
+            # pooled connections keep their PRAGMAs, so restore them afterwards
+            previous = {
+                name: conn.execute(sqla.text(f"PRAGMA {name}")).scalar()
+                for name in pragmas
+            }
+
+            for name, value in pragmas.items():
+                conn.execute(sqla.text(f"PRAGMA {name} = {int(value)}"))
+
+            try:
+                yield
+            finally:
+                for name, value in previous.items():
+                    conn.execute(sqla.text(f"PRAGMA {name} = {int(value)}"))
@@ -9,10 +9,13 @@ from typing import (
     Any,
     Collection,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -117,6 +120,31 @@ class TerracottaDriver:
         """
         return self.meta_store.connect(verify=verify)
 
+    def bulk_insert_mode(
+        self, unsafe: bool = False
+    ) -> contextlib.AbstractContextManager:
+        """Context manager to speed up many consecutive insertions.
+
+        Keeps a connection to the metastore open and lets the metastore tune it for
+        write throughput (e.g. larger caches for SQLite). Settings are restored on exit.
+
+        Arguments:
+
+            unsafe: Also sacrifice durability for speed. If the process crashes or the
+                machine loses power during insertion, the database may be corrupted.
+
+        Example:
+
+            >>> import terracotta as tc
+            >>> driver = tc.get_driver('tc.sqlite')
+            >>> with driver.bulk_insert_mode():
+            ...     driver.insert_many(
+            ...         (keys, dataset, None) for keys, dataset in datasets.items()
+            ...     )
+
+        """
+        return self.meta_store.bulk_insert_mode(unsafe=unsafe)
+
     def get_keys(self) -> OrderedDict:
         """Get all known keys and their fulltext descriptions.
 
@@ -154,6 +182,19 @@ class TerracottaDriver:
             limit=limit,
         )
 
+    def get_dataset_keys(self) -> Set[Tuple[str, ...]]:
+        """Get all known dataset key combinations.
+
+        Cheaper than :meth:`get_datasets` if only the keys are needed, e.g. to
+        check whether a dataset exists.
+
+        Returns:
+
+            A :class:`set` of key sequence tuples.
+
+        """
+        return self.meta_store.get_dataset_keys()
+
     def get_metadata(self, keys: ExtendedKeysType) -> Dict[str, Any]:
         """Return all stored metadata for given keys.
 
@@ -236,6 +277,60 @@ class TerracottaDriver:
 
         self.meta_store.insert(keys=keys, path=override_path or path, metadata=metadata)
 
+    def insert_many(
+        self,
+        datasets: Iterable[Tuple[ExtendedKeysType, str, Optional[Mapping[str, Any]]]],
+        *,
+        skip_metadata: bool = False,
+        batch_size: int = 1000,
+        encoded_metadata: bool = False,
+    ) -> None:
+        """Register many datasets at once. Used to populate meta store in bulk.
+
+        Much faster than repeated calls to :meth:`insert`, since the meta store
+        only commits once per batch instead of once per dataset.
+
+        Arguments:
+
+            datasets: Iterable of ``(keys, path, metadata)`` tuples, with the same
+                meaning as the corresponding arguments of :meth:`insert`. Metadata
+                may be ``None``, in which case it is computed via :meth:`compute_metadata`.
+            skip_metadata: If True, will skip metadata computation for all datasets
+                without given metadata (will be computed during first request instead).
+            batch_size: Number of datasets to insert per transaction.
+            encoded_metadata: If True, all given metadata has already been transformed
+                via ``meta_store.encode_metadata``, so the (possibly expensive) encoding
+                can happen elsewhere, e.g. in the process computing the metadata.
+
+        Example:
+
+            >>> import terracotta as tc
+            >>> driver = tc.get_driver('tc.sqlite')
+            >>> driver.insert_many(
+            ...     (keys, dataset, None) for keys, dataset in datasets.items()
+            ... )
+
+        """
+
+        def standardized_datasets() -> Iterator[
+            Tuple[KeysType, str, Optional[Mapping[str, Any]]]
+        ]:
+            for keys, path, metadata in datasets:
+                keys = self._standardize_keys(keys)
+
+                if metadata is None and not skip_metadata:
+                    metadata = self.compute_metadata(path)
+                    if encoded_metadata:
+                        metadata = self.meta_store.encode_metadata(metadata)
+
+                yield keys, path, metadata
+
+        self.meta_store.insert_many(
+            standardized_datasets(),
+            batch_size=batch_size,
+            encoded_metadata=encoded_metadata,
+        )
+
     def delete(self, keys: ExtendedKeysType) -> None:
         """Remove a dataset from the meta store.
 
@@ -2,10 +2,12 @@
 
 Custom click parameter types and utilities.
 """
-from typing import List, Any, Tuple, Dict
+from typing import List, Any, Tuple, Dict, Iterator, Pattern, Sequence
 from datetime import datetime, timedelta
 import pathlib
 import contextlib
+import fnmatch
+import functools
 import glob
 import re
 import os
@@ -15,12 +17,13 @@ import click
 
 
 class GlobbityGlob(click.ParamType):
-    """Expands a glob pattern to Path objects"""
+    """Expands a glob pattern to an iterator over Path objects"""
 
     name = "glob"
 
-    def convert(self, value: str, *args: Any) -> List[pathlib.Path]:
-        return [pathlib.Path(f) for f in glob.glob(value)]
+    def convert(self, value: str, *args: Any) -> Iterator[pathlib.Path]:
+        # lazy, so matches are only materialized once by the consumer
+        return map(pathlib.Path, glob.iglob(value))
 
 
 class PathlibPath(click.Path):
@@ -50,6 +53,7 @@ def _parse_raster_pattern(raster_pattern: str) -> Tuple[List[str], str, str]:
     parsed_value = string.Formatter().parse(raster_pattern)
 
     keys: List[str] = []
+    key_pos: Dict[str, int] = {}
     glob_pattern: List[str] = []
     regex_pattern: List[str] = []
 
@@ -66,18 +70,89 @@ def _parse_raster_pattern(raster_pattern: str) -> Tuple[List[str], str, str]:
         if field_name == "":
             # unnamed placeholder
             regex_pattern.append(".*?")
-        elif field_name in keys:
+        elif field_name in key_pos:
             # duplicate placeholder
-            key_group_number = keys.index(field_name) + 1
+            key_group_number = key_pos[field_name] + 1
             regex_pattern.append(rf"\{key_group_number}")
         else:
             # new placeholder
+            key_pos[field_name] = len(keys)
             keys.append(field_name)
             regex_pattern += rf"(?P<{field_name}>[^\W_]+)"
 
     return keys, "".join(glob_pattern), "".join(regex_pattern)
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_raster_pattern(
+    raster_pattern: str,
+) -> Tuple[Tuple[str, ...], str, Pattern[str]]:
+    """Validate and compile a raster pattern string (cached).
+
+    Like :func:`_parse_raster_pattern`, but returns a compiled regular expression.
+    Raises ValueError with a user-facing message on invalid patterns.
+    """
+    try:
+        keys, glob_pattern, regex_pattern = _parse_raster_pattern(raster_pattern)
+    except ValueError as exc:
+        raise ValueError(f"Invalid pattern: {exc!s}") from exc
+
+    if not keys:
+        raise ValueError("Pattern must contain at least one placeholder")
+
+    # keys become regex group names, which have to be valid identifiers
+    if not all(key.isidentifier() for key in keys):
+        raise ValueError("Key names must be alphanumeric")
+
+    return tuple(keys), glob_pattern, re.compile(regex_pattern)
+
+
+def _iter_glob(glob_pattern: str) -> Iterator[str]:
+    """Yield all paths matching the given absolute glob pattern.
+
+    Like :func:`glob.iglob`, but only lists directories for path components
+    containing wildcards, using :func:`os.scandir` to avoid extra system calls.
+    """
+    drive, path = os.path.splitdrive(glob_pattern)
+    segments = [segment for segment in path.split(os.sep) if segment]
+    if segments:
+        yield from _iter_glob_segments(drive + os.sep, segments)
+
+
+def _iter_glob_segments(root: str, segments: Sequence[str]) -> Iterator[str]:
+    segment, remaining = segments[0], segments[1:]
+
+    if not glob.has_magic(segment):
+        # literal path component, no need to list directory
+        path = os.path.join(root, segment)
+        if remaining:
+            yield from _iter_glob_segments(path, remaining)
+        elif os.path.lexists(path):
+            yield path
+        return
+
+    match_segment = re.compile(fnmatch.translate(os.path.normcase(segment))).match
+    include_hidden = segment.startswith(".")  # same as glob
+
+    try:
+        with os.scandir(root) as entries:
+            matches = [
+                entry
+                for entry in entries
+                if (include_hidden or not entry.name.startswith("."))
+                and match_segment(os.path.normcase(entry.name))
+            ]
+    except OSError:
+        # root does not exist or is not a directory
+        return
+
+    for entry in matches:
+        if not remaining:
+            yield entry.path
+        elif entry.is_dir():
+            yield from _iter_glob_segments(entry.path, remaining)
+
+
 class RasterPattern(click.ParamType):
     """Expands a pattern following the Python format specification to matching files"""
 
@@ -86,37 +161,29 @@ class RasterPattern(click.ParamType):
     def convert(self, value: str, *args: Any) -> RasterPatternType:
         value = os.path.abspath(value)
         try:
-            keys, glob_pattern, regex_pattern = _parse_raster_pattern(value)
+            keys, glob_pattern, regex = _compile_raster_pattern(value)
         except ValueError as exc:
-            self.fail(f"Invalid pattern: {exc!s}")
+            self.fail(str(exc))
 
-        if not keys:
-            self.fail("Pattern must contain at least one placeholder")
+        # use glob to find candidates, regex to extract placeholder values
+        candidates = _iter_glob(glob_pattern)
+        match_candidate = regex.match
 
-        if not all(re.match(r"\w", key) for key in keys):
-            self.fail("Key names must be alphanumeric")
+        files: Dict[Tuple[str, ...], str] = {}
+        for match in map(match_candidate, candidates):
+            if not match:
+                continue
 
-        # use glob to find candidates, regex to extract placeholder values
-        candidates = (os.path.abspath(c) for c in glob.glob(glob_pattern))
-        matched_candidates = [
-            re.match(regex_pattern, candidate) for candidate in candidates
-        ]
+            key_combination = match.groups()
+            if key_combination in files:
+                self.fail("Pattern leads to duplicate keys")
+
+            files[key_combination] = match.group(0)
 
-        if not any(matched_candidates):
+        if not files:
             self.fail("Given pattern matches no files")
 
-        key_combinations = [
-            tuple(match.groups()) for match in matched_candidates if match
-        ]
-        if len(key_combinations) != len(set(key_combinations)):
-            self.fail("Pattern leads to duplicate keys")
-
-        files = {
-            tuple(match.groups()): match.group(0)
-            for match in matched_candidates
-            if match
-        }
-        return keys, files
+        return list(keys), files
 
 
 class TOMLFile(click.ParamType):
@@ -3,13 +3,27 @@
 A convenience tool to create a Terracotta database from some raster files.
 """
 
-from typing import Optional, Tuple, Sequence, Any
+from typing import (
+    Optional,
+    Tuple,
+    Sequence,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+)
 from pathlib import Path
+import os
 import logging
+import operator
+import itertools
+import contextlib
+import concurrent.futures
 from datetime import datetime, timedelta
 import click
-import tqdm
-import requests
 
 from terracotta.scripts.click_types import RasterPattern, RasterPatternType, PathlibPath, TimeDeltaType
 
@@ -17,6 +31,55 @@ from terracotta.scripts.click_types import RasterPattern, RasterPatternType, Pat
 logger = logging.getLogger(__name__)
 
 
+def _compute_metadata(driver_path: str, raster_path: str) -> Mapping[str, Any]:
+    from terracotta import get_driver
+
+    # encode here, so the writing process only has to bind the values
+    driver = get_driver(driver_path)
+    return driver.meta_store.encode_metadata(driver.compute_metadata(raster_path))
+
+
+def _compute_metadata_parallel(
+    executor: concurrent.futures.Executor,
+    driver_path: str,
+    raster_files: Iterable[Tuple[Tuple[str, ...], str]],
+    max_pending: int,
+) -> Generator[Tuple[Tuple[str, ...], str, Mapping[str, Any]], None, None]:
+    # only keep a bounded number of tasks (and results) alive at any time
+    raster_files = iter(raster_files)
+    futures: Dict[concurrent.futures.Future, Tuple[Tuple[str, ...], str]] = {}
+
+    def submit(num_tasks: int) -> None:
+        for key, filepath in itertools.islice(raster_files, num_tasks):
+            future = executor.submit(_compute_metadata, driver_path, filepath)
+            futures[future] = (key, filepath)
+
+    try:
+        submit(max_pending)
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            submit(len(done))
+
+            while done:
+                # drop all references to results once they are handed off
+                future = done.pop()
+                key, filepath = futures.pop(future)
+                try:
+                    metadata = future.result()
+                except Exception as exc:
+                    raise RuntimeError(
+                        f"Error while computing metadata for file {filepath}"
+                    ) from exc
+                yield key, filepath, metadata
+    finally:
+        # on errors or early exit, don't wait for pending tasks on executor shutdown
+        for future in futures:
+            future.cancel()
+
+
 @click.command(
     "ingest", short_help="Ingest a collection of raster files into a SQLite database."
 )
@@ -49,6 +112,28 @@ logger = logging.getLogger(__name__)
     default=None,
     help="Ignore files older than the specified threshold (e.g., 30m, 2h, etc.)",
 )
+@click.option(
+    "--batch-size",
+    default=1000,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Number of raster files to write to the database per transaction",
+)
+@click.option(
+    "--unsafe-fast",
+    is_flag=True,
+    default=False,
+    help="Speed up writing to the database by not waiting for data to reach the disk "
+    "(the database may be corrupted if ingestion is interrupted by a crash or power loss)",
+)
+@click.option(
+    "--nproc",
+    default=1,
+    type=click.INT,
+    help="Number of processes to use for computing metadata "
+    "[default: 1, i.e., single-core processing] "
+    "Set to -1 to use all available (logical) cores",
+)
 @click.option(
     "-q",
     "--quiet",
@@ -64,6 +149,9 @@ def ingest(
     rgb_key: Optional[str] = None,
     skip_existing: bool = False,
     ignore_older_than: Optional[timedelta] = None,
+    batch_size: int = 1000,
+    unsafe_fast: bool = False,
+    nproc: int = 1,
     quiet: bool = False,
 ) -> None:
     """Ingest a collection of raster files into a (new or existing) SQLite database.
@@ -81,63 +169,120 @@ def ingest(
     This command only supports the creation of a simple, local SQLite database without any
     additional metadata. For more sophisticated use cases use the Terracotta Python API.
     """
-    from terracotta import get_driver
+    from terracotta import get_driver, get_settings
 
     keys, raster_files = raster_pattern
 
+    reorder_keys: Optional[Callable[[Sequence[str]], Tuple[str, ...]]] = None
+
     if rgb_key is not None:
         if rgb_key not in keys:
             raise click.BadParameter("RGB key not found in raster pattern")
 
-        # re-order keys
+        # re-order keys so that the RGB key comes last
         rgb_idx = keys.index(rgb_key)
-
-        def push_to_last(seq: Sequence[Any], index: int) -> Tuple[Any, ...]:
-            return (*seq[:index], *seq[index + 1 :], seq[index])
-
-        keys = list(push_to_last(keys, rgb_idx))
-        raster_files = {push_to_last(k, rgb_idx): v for k, v in raster_files.items()}
+        if rgb_idx != len(keys) - 1:
+            permutation = (*range(rgb_idx), *range(rgb_idx + 1, len(keys)), rgb_idx)
+            reorder_keys = operator.itemgetter(*permutation)
+            keys = list(reorder_keys(keys))
 
     driver = get_driver(output_file)
     if not output_file.is_file():
         driver.create(keys)
 
-    if skip_existing:
-        existing = driver.get_datasets()
-        raster_files = {
-            key: path for key, path in raster_files.items() if key not in existing
-        }
-
     if tuple(keys) != driver.key_names:
         click.echo(
             f"Database file {output_file!s} has incompatible key names {driver.key_names}",
             err=True,
         )
-        click.Abort()
-    
+        raise click.Abort()
+
+    existing = driver.get_dataset_keys() if skip_existing else set()
+
+    cutoff_timestamp: Optional[float] = None
     if ignore_older_than is not None:
         if isinstance(ignore_older_than, timedelta):
             cutoff_time = datetime.now() - ignore_older_than
         elif isinstance(ignore_older_than, datetime):
             cutoff_time = ignore_older_than
 
-        raster_files = {
-            key: path for key, path in raster_files.items()
-            if datetime.fromtimestamp(Path(path).stat().st_mtime) > cutoff_time
-        }
-    
-    with driver.connect():
-        progress = tqdm.tqdm(
-            raster_files.items(), desc="Ingesting raster files", disable=quiet
-        )
-        for key, filepath in progress:
-            driver.insert(key, filepath, skip_metadata=skip_metadata)
-    
-    try:
-        response = requests.post(
-            "http://localhost:5000/clear_cache", 
-            params={"driver_path": str(output_file)}  # Send the driver path as a query parameter
-        )
-        response.raise_for_status()  # Raise an error for bad responses
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to clear cache: {e}")
+        # compare raw timestamps to avoid creating a datetime object per file
+        cutoff_timestamp = cutoff_time.timestamp()
+
+    def filter_raster_files() -> Iterator[Tuple[Tuple[str, ...], str]]:
+        # re-order keys and apply all filters in a single pass
+        for key, path in raster_files.items():
+            if reorder_keys is not None:
+                key = reorder_keys(key)
+
+            if key in existing:
+                continue
+
+            if (
+                cutoff_timestamp is not None
+                and os.stat(path).st_mtime <= cutoff_timestamp
+            ):
+                continue
+
+            yield key, path
+
+    raster_files = dict(filter_raster_files())
+
+    if nproc == -1:
+        nproc = os.cpu_count() or 1  # Default to 1 if `cpu_count` returns None
+
+    use_pool = nproc > 1 and not skip_metadata
+
+    with contextlib.ExitStack() as outer_env:
+        if use_pool:
+            # compute metadata in worker processes, write from this process only
+            executor = outer_env.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=nproc)
+            )
+            # closed before the executor shuts down, so failed inserts cancel pending tasks
+            datasets: Iterator[
+                Tuple[Tuple[str, ...], str, Optional[Mapping[str, Any]]]
+            ] = outer_env.enter_context(
+                contextlib.closing(
+                    _compute_metadata_parallel(
+                        executor, str(output_file), raster_files.items(), 4 * nproc
+                    )
+                )
+            )
+        else:
+            datasets = ((key, filepath, None) for key, filepath in raster_files.items())
+
+        if not quiet:
+            import tqdm
+
+            # limit redraws, which are noticeable when inserts are cheap
+            datasets = tqdm.tqdm(
+                datasets,
+                total=len(raster_files),
+                desc="Ingesting raster files",
+                mininterval=0.5,
+                miniters=max(1, len(raster_files) // 200),
+            )
+
+        with driver.bulk_insert_mode(unsafe=unsafe_fast):
+            driver.insert_many(
+                datasets,
+                skip_metadata=skip_metadata,
+                batch_size=batch_size,
+                encoded_metadata=use_pool,
+            )
+
+    settings = get_settings()
+    if settings.CLEAR_CACHE_URL:
+        # let a running server know that the database changed
+        import requests
+
+        try:
+            response = requests.post(
+                settings.CLEAR_CACHE_URL,
+                params={"driver_path": str(output_file)},
+                timeout=(1, 2),
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as exc:
+            logger.warning(f"Failed to clear server cache: {exc!s}")
@@ -4,7 +4,7 @@ Convert some raster files to cloud-optimized GeoTiff for use with Terracotta.
 """
 
 from datetime import datetime, timedelta
-from typing import Any, Sequence, Iterator, Union
+from typing import Any, Iterable, Sequence, Iterator, Union
 import os
 import sys
 import math
@@ -267,7 +267,7 @@ def _optimize_single_raster(
     help="Ignore files older than the given relative time (e.g. '30m', '2h') or absolute timestamp ('YYYY-MM-DD HH:MM:SS')."
 )
 def optimize_rasters(
-    raster_files: Sequence[Sequence[Path]],
+    raster_files: Sequence[Iterable[Path]],
     output_folder: Path,
     overwrite: bool = False,
     skip_existing: bool = False,
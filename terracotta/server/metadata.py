@@ -90,6 +90,12 @@ class MultipleMetadataDatasetsSchema(Schema):
     )
 
 
+# schemas hold no per-request state, so instances are shared between requests
+_METADATA_SCHEMA = MetadataSchema()
+_COLUMNS_SCHEMA = MetadataColumnsSchema()
+_DATASETS_SCHEMA = MultipleMetadataDatasetsSchema()
+
+
 @METADATA_API.route("/metadata/<path:keys>", methods=["GET"])
 def get_metadata(keys: str) -> Response:
     """Get metadata for given dataset
@@ -114,14 +120,13 @@ def get_metadata(keys: str) -> Response:
     """
     from terracotta.handlers.metadata import metadata
 
-    columns_schema = MetadataColumnsSchema()
-    columns = columns_schema.load(request.args).get("columns")
+    columns = _COLUMNS_SCHEMA.load(request.args).get("columns")
 
     parsed_keys = [key for key in keys.split("/") if key]
 
     payload = metadata(columns, parsed_keys)
-    schema = MetadataSchema(partial=columns is not None)
-    return jsonify(schema.load(payload))
+    # payload comes from the handler, so it only needs to be serialized, not validated
+    return jsonify(_METADATA_SCHEMA.dump(payload))
 
 
 @METADATA_API.route("/metadata", methods=["POST"])
@@ -155,12 +160,8 @@ def get_multiple_metadata() -> Response:
     if not isinstance(request_body, dict):
         raise InvalidArgumentsError("Request body must be a JSON object")
 
-    datasets_schema = MultipleMetadataDatasetsSchema()
-    datasets = datasets_schema.load(request_body).get("keys")
-
-    columns_schema = MetadataColumnsSchema()
-    columns = columns_schema.load(request.args).get("columns")
+    datasets = _DATASETS_SCHEMA.load(request_body).get("keys")
+    columns = _COLUMNS_SCHEMA.load(request.args).get("columns")
 
     payload = multiple_metadata(columns, datasets)
-    schema = MetadataSchema(many=True, partial=columns is not None)
-    return jsonify(schema.load(payload))
+    return jsonify(_METADATA_SCHEMA.dump(payload, many=True))
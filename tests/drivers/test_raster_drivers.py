@@ -46,6 +46,22 @@ def test_insertion_and_retrieval(driver_path, provider, raster_file):
     assert all(key in metadata for key in METADATA_KEYS)
 
 
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_get_dataset_keys(driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("some", "keynames")
+
+    db.create(keys)
+    assert db.get_dataset_keys() == set()
+
+    db.insert(["some", "value"], str(raster_file), skip_metadata=True)
+    db.insert(["some", "other_value"], str(raster_file), skip_metadata=True)
+
+    assert db.get_dataset_keys() == set(db.get_datasets())
+
+
 @pytest.mark.parametrize("provider", DRIVERS)
 def test_path_override(driver_path, provider, raster_file):
     from terracotta import drivers
@@ -277,6 +293,132 @@ def test_invalid_group_insertion(monkeypatch, driver_path, provider, raster_file
         assert ("foo",) not in datasets
 
 
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_many(monkeypatch, driver_path, provider, raster_file):
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    keys = ("keyname",)
+
+    db.create(keys)
+
+    metadata = db.compute_metadata(str(raster_file))
+    db.insert_many(
+        [
+            (["foo"], str(raster_file), metadata),
+            ({"keyname": "bar"}, str(raster_file), None),
+        ],
+        skip_metadata=True,
+    )
+
+    datasets = db.get_datasets()
+    assert datasets == {("bar",): str(raster_file), ("foo",): str(raster_file)}
+    assert db.meta_store.get_metadata({"keyname": "foo"}) is not None
+    assert db.meta_store.get_metadata({"keyname": "bar"}) is None
+
+    def throw(*args, **kwargs):
+        raise NotImplementedError()
+
+    with monkeypatch.context() as m:
+        m.setattr(db, "compute_metadata", throw)
+
+        with pytest.raises(NotImplementedError):
+            db.insert_many(
+                [
+                    (["a"], str(raster_file), metadata),
+                    (["b"], str(raster_file), metadata),
+                    (["c"], str(raster_file), None),
+                ],
+                batch_size=2,
+            )
+
+    # first batch was committed, second one was rolled back
+    datasets = db.get_datasets()
+    assert ("a",) in datasets
+    assert ("b",) in datasets
+    assert ("c",) not in datasets
+
+    # last occurrence of duplicate keys wins
+    db.insert_many(
+        [(["foo"], "first", None), (["foo"], "second", None)], skip_metadata=True
+    )
+    assert db.get_datasets()[("foo",)] == "second"
+
+    # pre-encoded metadata is stored as-is
+    encoded = db.meta_store.encode_metadata(metadata)
+    db.insert_many(
+        [(["enc"], str(raster_file), encoded), (["comp"], str(raster_file), None)],
+        encoded_metadata=True,
+    )
+    assert db.get_metadata(["enc"]) == db.get_metadata(["a"])
+    assert db.get_metadata(["comp"]) == db.get_metadata(["a"])
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+@pytest.mark.parametrize("unsafe", [False, True])
+def test_bulk_insert_mode(driver_path, provider, raster_file, unsafe):
+    import sqlalchemy as sqla
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    db.create(("keyname",))
+
+    def get_pragmas():
+        with db.connect() as conn:
+            return {
+                name: conn.execute(sqla.text(f"PRAGMA {name}")).scalar()
+                for name in ("temp_store", "cache_size", "synchronous")
+            }
+
+    pragmas_before = get_pragmas()
+
+    with db.bulk_insert_mode(unsafe=unsafe):
+        pragmas_during = get_pragmas()
+        db.insert_many(
+            [(["foo"], str(raster_file), None), (["bar"], str(raster_file), None)],
+            skip_metadata=True,
+        )
+
+    assert pragmas_during["temp_store"] == 2
+    assert pragmas_during["cache_size"] == -200_000
+    if unsafe:
+        assert pragmas_during["synchronous"] == 0
+    else:
+        assert pragmas_during["synchronous"] == pragmas_before["synchronous"]
+
+    assert get_pragmas() == pragmas_before
+    assert set(db.get_datasets()) == {("foo",), ("bar",)}
+
+
+@pytest.mark.parametrize("provider", DRIVERS)
+def test_insert_many_releases_batches(driver_path, provider, raster_file):
+    import weakref
+    from terracotta import drivers
+
+    db = drivers.get_driver(driver_path, provider=provider)
+    db.create(("keyname",))
+    encoded = db.meta_store.encode_metadata(db.compute_metadata(str(raster_file)))
+
+    class Row(dict):
+        pass
+
+    refs = []
+
+    def track(row):
+        refs.append(weakref.ref(row))
+        return row
+
+    def datasets():
+        for i in range(6):
+            if i % 2 == 0:
+                # previous batches must not be referenced anymore
+                assert all(ref() is None for ref in refs)
+            yield {"keyname": str(i)}, str(raster_file), track(Row(encoded))
+
+    db.meta_store.insert_many(datasets(), batch_size=2, encoded_metadata=True)
+    assert len(db.get_datasets()) == 6
+
+
 def insertion_worker(key, path, raster_file, provider):
     import time
     from terracotta import drivers
@@ -3,6 +3,7 @@ from click.testing import CliRunner
 
 import os
 import shutil
+import time
 
 TEST_CASES = (
     {  # basic
@@ -29,6 +30,12 @@ TEST_CASES = (
         "expected_keys": ["sensor", "date", "band"],
         "expected_datasets": [("S2", "20180101", "B04"), ("S2", "20180101", "B05")],
     },
+    {  # literal folders between placeholders
+        "filenames": ["S2/bands/20180101_B04.tif", "S2/other/20180101_B05.tif"],
+        "input_pattern": "{sensor}/bands/{date}_{band}.tif",
+        "expected_keys": ["sensor", "date", "band"],
+        "expected_datasets": [("S2", "20180101", "B04")],
+    },
     {  # keys occuring more than once
         "filenames": ["S2/20180101/S2_20180101_B04.tif"],
         "input_pattern": "{sensor}/{date}/{sensor}_{date}_{band}.tif",
@@ -97,6 +104,11 @@ INVALID_TEST_CASES = (
         "input_pattern": "{(foo)}.tif",
         "error_contains": "must be alphanumeric",
     },
+    {  # placeholder name starting with a digit
+        "filenames": ["foo.tif"],
+        "input_pattern": "{1foo}.tif",
+        "error_contains": "must be alphanumeric",
+    },
 )
 
 
@@ -128,6 +140,221 @@ def test_ingest(raster_file, tmpdir):
     assert driver.get_datasets() == {("img",): str(raster_file)}
 
 
+def test_ingest_nproc(raster_file, tmpworkdir):
+    from terracotta.scripts import cli
+
+    for infile in ("img1.tif", "img2.tif", "img3.tif"):
+        shutil.copy(raster_file, tmpworkdir / infile)
+
+    outfile = tmpworkdir / "out.sqlite"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.cli, ["ingest", "{name}.tif", "-o", str(outfile), "--nproc", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert outfile.check()
+
+    from terracotta import get_driver
+
+    driver = get_driver(str(outfile), provider="sqlite")
+    assert set(driver.get_datasets()) == {("img1",), ("img2",), ("img3",)}
+    assert all(
+        driver.meta_store.get_metadata({"name": name}) is not None
+        for name in ("img1", "img2", "img3")
+    )
+
+
+def test_compute_metadata_parallel_bounded(monkeypatch):
+    import concurrent.futures
+    from terracotta.scripts import ingest
+
+    monkeypatch.setattr(
+        ingest, "_compute_metadata", lambda driver_path, path: {"path": path}
+    )
+
+    submitted = []
+
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            submitted.append(future)
+            return future
+
+    raster_files = [((str(i),), f"{i}.tif") for i in range(20)]
+
+    with RecordingExecutor(max_workers=2) as executor:
+        results = ingest._compute_metadata_parallel(executor, "db", raster_files, 3)
+        next(results)
+        # tasks are submitted lazily, as results are consumed
+        assert len(submitted) < len(raster_files)
+        remaining = list(results)
+
+    assert len(submitted) == len(raster_files)
+    assert len(remaining) == len(raster_files) - 1
+
+
+def test_compute_metadata_parallel_cancel(monkeypatch):
+    import concurrent.futures
+    from terracotta.scripts import ingest
+
+    def compute_metadata(driver_path, path):
+        if path == "0.tif":
+            raise ValueError("broken file")
+        time.sleep(0.1)
+        return {"path": path}
+
+    monkeypatch.setattr(ingest, "_compute_metadata", compute_metadata)
+
+    submitted = []
+
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            submitted.append(future)
+            return future
+
+    raster_files = [((str(i),), f"{i}.tif") for i in range(20)]
+
+    with RecordingExecutor(max_workers=1) as executor:
+        results = ingest._compute_metadata_parallel(executor, "db", raster_files, 20)
+        with pytest.raises(RuntimeError, match="0.tif"):
+            list(results)
+
+    # pending tasks are not computed after a failure
+    assert any(future.cancelled() for future in submitted)
+
+
+@pytest.mark.parametrize("batch_size", ["1", "2", "1000"])
+def test_ingest_batch_size(batch_size, raster_file, tmpworkdir):
+    from terracotta.scripts import cli
+
+    for infile in ("img1.tif", "img2.tif", "img3.tif"):
+        shutil.copy(raster_file, tmpworkdir / infile)
+
+    outfile = tmpworkdir / "out.sqlite"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.cli,
+        [
+            "ingest",
+            "{name}.tif",
+            "-o",
+            str(outfile),
+            "--skip-metadata",
+            "--batch-size",
+            batch_size,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    from terracotta import get_driver
+
+    driver = get_driver(str(outfile), provider="sqlite")
+    assert set(driver.get_datasets()) == {("img1",), ("img2",), ("img3",)}
+
+
+def test_ingest_repeated_pattern(raster_file, tmpworkdir):
+    from terracotta.scripts import cli
+
+    shutil.copy(raster_file, tmpworkdir / "img1.tif")
+    outfile = tmpworkdir / "out.sqlite"
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cli, ["ingest", "{name}.tif", "-o", str(outfile)])
+    assert result.exit_code == 0, result.output
+
+    # compiled pattern is cached, but files must be matched again
+    shutil.copy(raster_file, tmpworkdir / "img2.tif")
+    result = runner.invoke(cli.cli, ["ingest", "{name}.tif", "-o", str(outfile)])
+    assert result.exit_code == 0, result.output
+
+    from terracotta import get_driver
+
+    driver = get_driver(str(outfile), provider="sqlite")
+    assert set(driver.get_datasets()) == {("img1",), ("img2",)}
+
+
+def test_ingest_unsafe_fast(raster_file, tmpworkdir):
+    from terracotta.scripts import cli
+
+    for infile in ("img1.tif", "img2.tif"):
+        shutil.copy(raster_file, tmpworkdir / infile)
+
+    outfile = tmpworkdir / "out.sqlite"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.cli, ["ingest", "{name}.tif", "-o", str(outfile), "--unsafe-fast"]
+    )
+    assert result.exit_code == 0, result.output
+
+    from terracotta import get_driver
+
+    driver = get_driver(str(outfile), provider="sqlite")
+    assert set(driver.get_datasets()) == {("img1",), ("img2",)}
+
+
+def test_ingest_ignore_older_than(raster_file, tmpworkdir):
+    from terracotta.scripts import cli
+
+    for infile in ("old.tif", "new.tif"):
+        shutil.copy(raster_file, tmpworkdir / infile)
+
+    two_hours_ago = time.time() - 2 * 60 * 60
+    os.utime(tmpworkdir / "old.tif", (two_hours_ago, two_hours_ago))
+
+    outfile = tmpworkdir / "out.sqlite"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.cli,
+        ["ingest", "{name}.tif", "-o", str(outfile), "--ignore-older-than", "1h"],
+    )
+    assert result.exit_code == 0, result.output
+
+    from terracotta import get_driver
+
+    driver = get_driver(str(outfile), provider="sqlite")
+    assert set(driver.get_datasets()) == {("new",)}
+
+
+@pytest.mark.parametrize("clear_cache_url", [None, "http://localhost:5000/clear_cache"])
+def test_ingest_clear_cache(clear_cache_url, raster_file, tmpdir, monkeypatch):
+    import requests
+    from terracotta import update_settings
+    from terracotta.scripts import cli
+
+    calls = []
+
+    class MockResponse:
+        def raise_for_status(self):
+            pass
+
+    def mock_post(url, **kwargs):
+        calls.append((url, kwargs))
+        return MockResponse()
+
+    monkeypatch.setattr(requests, "post", mock_post)
+    update_settings(CLEAR_CACHE_URL=clear_cache_url)
+
+    outfile = tmpdir / "out.sqlite"
+    input_pattern = str(raster_file.dirpath("{name}.tif"))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cli, ["ingest", input_pattern, "-o", str(outfile)])
+    assert result.exit_code == 0, result.output
+
+    if clear_cache_url is None:
+        assert not calls
+    else:
+        assert len(calls) == 1
+        url, kwargs = calls[0]
+        assert url == clear_cache_url
+        assert kwargs["params"] == {"driver_path": str(outfile)}
+
+
 def test_ingest_append(raster_file, tmpworkdir):
     from terracotta.scripts import cli
 
@@ -275,11 +502,19 @@ def test_ingest_invalid_pattern(case, raster_file, tmpworkdir):
     assert case["error_contains"].lower() in result.output.lower()
 
 
-def test_ingest_rgb_key(raster_file, tmpdir):
+@pytest.mark.parametrize(
+    "pattern, expected_keys, expected_dataset",
+    [
+        ("{rgb}m{foo}.tif", ("foo", "rgb"), ("g", "i")),
+        ("{foo}m{rgb}.tif", ("foo", "rgb"), ("i", "g")),
+        ("{rgb}.tif", ("rgb",), ("img",)),
+    ],
+)
+def test_ingest_rgb_key(pattern, expected_keys, expected_dataset, raster_file, tmpdir):
     from terracotta.scripts import cli
 
     outfile = tmpdir / "out.sqlite"
-    input_pattern = str(raster_file.dirpath("{rgb}m{foo}.tif"))
+    input_pattern = str(raster_file.dirpath(pattern))
 
     runner = CliRunner()
     result = runner.invoke(
@@ -291,8 +526,8 @@ def test_ingest_rgb_key(raster_file, tmpdir):
     from terracotta import get_driver
 
     driver = get_driver(str(outfile), provider="sqlite")
-    assert driver.key_names == ("foo", "rgb")
-    assert driver.get_datasets() == {("g", "i"): str(raster_file)}
+    assert driver.key_names == expected_keys
+    assert driver.get_datasets() == {expected_dataset: str(raster_file)}
 
 
 def test_ingest_invalid_rgb_key(raster_file, tmpdir):